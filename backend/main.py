@@ -1,18 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.tools import tool
 from langchain_core.prompts import ChatPromptTemplate
-import requests
+import asyncio
+import httpx
 import os
+import uuid
 from dotenv import load_dotenv
-import json
-from typing import Dict, Any, List
+import orjson
+from typing import Dict, Any, List, Optional
 
 load_dotenv()
 
-app = FastAPI(title="Security Scanner Backend", version="0.1.0")
+# Shared HTTP client for MCP calls - created/closed with the app lifecycle
+http_client: httpx.AsyncClient = None
+
+# Global cap on concurrent outbound MCP calls, tunable via MAX_CONCURRENT
+outbound_semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT", "32")))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    # Bound the thread pool that asyncio.to_thread uses for blocking calls
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
+    http_client = httpx.AsyncClient(timeout=60)
+    yield
+    await http_client.aclose()
+
+app = FastAPI(
+    title="Security Scanner Backend",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -23,6 +49,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses - scan payloads are highly compressible
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize LLM with correct Gemini model
 api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
 if not api_key:
@@ -59,57 +88,53 @@ class ScanRequest(BaseModel):
 
 class ScanResponse(BaseModel):
     results: Dict[str, Any]
-    summary: str
+    summary: Optional[str] = None
+    task_id: Optional[str] = None
 
-# Define tools that call MCP server
-@tool
-def check_ssl_certificate(url: str, check_chain: bool = True) -> dict:
-    """Check SSL certificate validity and configuration."""
-    try:
-        response = requests.post(
-            f"{MCP_URL}/check_ssl", 
-            json={"url": url, "check_chain": check_chain},
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return {"error": f"SSL check failed: {str(e)}"}
+# Background summary generations keyed by task id, polled via
+# /scan/{task_id}/summary
+summary_tasks: Dict[str, asyncio.Task] = {}
 
-@tool
-def scan_vulnerabilities(url: str, scan_depth: str = "light") -> dict:
-    """Scan for common web vulnerabilities."""
+async def scan_all(url: str, scan_depth: str = "light") -> dict:
+    """Run all MCP security checks via a single aggregated call."""
     try:
-        response = requests.post(
-            f"{MCP_URL}/scan_vulnerabilities", 
-            json={"url": url, "scan_depth": scan_depth},
-            timeout=60
-        )
+        async with outbound_semaphore:
+            response = await http_client.post(
+                f"{MCP_URL}/scan_all",
+                json={"url": url, "scan_depth": scan_depth},
+                timeout=60
+            )
         response.raise_for_status()
         return response.json()
     except Exception as e:
-        return {"error": f"Vulnerability scan failed: {str(e)}"}
-
-@tool
-def analyze_security_headers(url: str) -> dict:
-    """Analyze HTTP security headers."""
-    try:
-        response = requests.post(
-            f"{MCP_URL}/analyze_security_headers", 
-            json={"url": url},
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return {"error": f"Security headers analysis failed: {str(e)}"}
-
-# Available tools
-tools = [check_ssl_certificate, scan_vulnerabilities, analyze_security_headers]
+        error = {"error": f"Scan failed: {str(e)}"}
+        return {"ssl": error, "vulnerabilities": error, "security_headers": error}
+
+# In-flight scans keyed by URL - duplicate requests arriving while a scan is
+# running await its result instead of issuing another MCP round-trip
+in_flight_scans: Dict[str, asyncio.Task] = {}
+
+async def scan_all_coalesced(url: str) -> dict:
+    """Run scan_all, sharing one in-flight call among duplicate requests."""
+    task = in_flight_scans.get(url)
+    if task is None:
+        # Detached task: a disconnecting caller cancels only its own await
+        # (shield), never the shared scan other waiters depend on
+        task = asyncio.create_task(scan_all(url))
+        in_flight_scans[url] = task
+        task.add_done_callback(lambda _: in_flight_scans.pop(url, None))
+    return await asyncio.shield(task)
 
 @app.post("/scan", response_model=ScanResponse)
-async def scan_website(request: ScanRequest):
-    """Main endpoint to scan a website for security issues."""
+async def scan_website(request: ScanRequest, stream: bool = False):
+    """Main endpoint to scan a website for security issues.
+
+    By default the scan results are returned immediately with a task_id;
+    the LLM summary is generated in the background and fetched from
+    /scan/{task_id}/summary. With ?stream=true the response is NDJSON
+    instead: the first line carries the scan results, followed by the
+    summary streamed token by token.
+    """
     try:
         # Clean URL
         url = request.url.strip().lower()
@@ -118,17 +143,14 @@ async def scan_website(request: ScanRequest):
         # Run all tools directly (simplified approach since Gemini tool calling can be tricky)
         print(f"Starting scan for {url}")
         
-        # Execute all security checks
-        ssl_result = check_ssl_certificate(url)
-        vuln_result = scan_vulnerabilities(url)
-        headers_result = analyze_security_headers(url)
-        
-        aggregated_results = {
-            "ssl": ssl_result,
-            "vulnerabilities": vuln_result,
-            "security_headers": headers_result
-        }
-        
+        # Execute all security checks via one aggregated MCP call - the MCP
+        # server runs them concurrently and returns a single JSON payload.
+        # Duplicate in-flight scans of the same URL share one round-trip.
+        aggregated_results = await scan_all_coalesced(url)
+        ssl_result = aggregated_results.get("ssl", {})
+        vuln_result = aggregated_results.get("vulnerabilities", {})
+        headers_result = aggregated_results.get("security_headers", {})
+
         print(f"Scan results: {aggregated_results}")
 
         # Generate summary with LLM
@@ -136,13 +158,13 @@ async def scan_website(request: ScanRequest):
 Analyze these security scan results for the website {url}:
 
 SSL Certificate Check:
-{json.dumps(ssl_result, indent=2)}
+{orjson.dumps(ssl_result, option=orjson.OPT_INDENT_2).decode()}
 
 Vulnerability Scan:
-{json.dumps(vuln_result, indent=2)}
+{orjson.dumps(vuln_result, option=orjson.OPT_INDENT_2).decode()}
 
 Security Headers Analysis:
-{json.dumps(headers_result, indent=2)}
+{orjson.dumps(headers_result, option=orjson.OPT_INDENT_2).decode()}
 
 Please provide a comprehensive security assessment including:
 1. Overall security rating (Excellent/Good/Fair/Poor/Critical)
@@ -154,20 +176,57 @@ Please provide a comprehensive security assessment including:
 Keep the summary clear and actionable.
 """
 
-        print("Generating AI summary...")
-        summary_response = llm.invoke(summary_prompt)
-        summary = summary_response.content if hasattr(summary_response, 'content') else str(summary_response)
-        print(f"AI summary generated: {summary[:100]}...")
+        if stream:
+            # Stream the summary so clients see first-token latency instead
+            # of waiting for the full generation
+            async def generate():
+                yield orjson.dumps({"results": aggregated_results}).decode() + "\n"
+                async for chunk in llm.astream(summary_prompt):
+                    content = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                    if content:
+                        yield content
+
+            # Content-Encoding: identity keeps GZipMiddleware from buffering
+            # the per-token stream in its compressor
+            return StreamingResponse(
+                generate(),
+                media_type="application/x-ndjson",
+                headers={"Content-Encoding": "identity"}
+            )
+
+        # Generate the summary in the background so the response isn't held
+        # open for the full LLM round-trip; prune finished tasks first
+        if len(summary_tasks) > 1024:
+            for tid in [t for t, task in summary_tasks.items() if task.done()]:
+                del summary_tasks[tid]
+
+        task_id = uuid.uuid4().hex
+        summary_tasks[task_id] = asyncio.create_task(llm.ainvoke(summary_prompt))
 
         return ScanResponse(
             results=aggregated_results,
-            summary=summary
+            task_id=task_id
         )
 
     except Exception as e:
         print(f"Scan error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
 
+@app.get("/scan/{task_id}/summary")
+async def get_scan_summary(task_id: str):
+    """Poll for the LLM summary of a previously started scan."""
+    task = summary_tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown task id")
+    if not task.done():
+        return {"status": "pending"}
+    if task.exception() is not None:
+        return {"status": "error", "error": str(task.exception())}
+
+    response = task.result()
+    summary = response.content if hasattr(response, 'content') else str(response)
+    return {"status": "ready", "summary": summary}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -177,7 +236,9 @@ async def health_check():
 async def test_llm():
     """Test endpoint to verify LLM is working."""
     try:
-        response = llm.invoke("Hello, please respond with 'LLM is working correctly'")
+        response = await asyncio.to_thread(
+            llm.invoke, "Hello, please respond with 'LLM is working correctly'"
+        )
         return {"status": "success", "response": response.content}
     except Exception as e:
         return {"status": "error", "error": str(e)}
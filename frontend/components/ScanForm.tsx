@@ -9,7 +9,8 @@ interface ScanResult {
     vulnerabilities?: any;
     security_headers?: any;
   };
-  summary: string;
+  summary?: string;
+  task_id?: string;
 }
 
 export default function ScanForm() {
@@ -21,6 +22,38 @@ export default function ScanForm() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
+  const pollSummary = async (backendUrl: string, taskId: string) => {
+    // The backend generates the AI summary in the background; poll until
+    // it's ready so the scan results can render immediately
+    for (let attempt = 0; attempt < 60; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      try {
+        const response = await axios.get(
+          `${backendUrl}/scan/${taskId}/summary`
+        );
+        if (response.data.status === "ready") {
+          setResult((prev) =>
+            prev ? { ...prev, summary: response.data.summary } : prev
+          );
+          return;
+        }
+        if (response.data.status === "error") {
+          setResult((prev) =>
+            prev
+              ? { ...prev, summary: `Summary failed: ${response.data.error}` }
+              : prev
+          );
+          return;
+        }
+      } catch {
+        // Transient polling errors - keep trying until the attempt limit
+      }
+    }
+    setResult((prev) =>
+      prev ? { ...prev, summary: "Summary timed out. Please try again." } : prev
+    );
+  };
+
   const validateUrl = (url: string) => {
     try {
       new URL(url.startsWith("http") ? url : `https://${url}`);
@@ -60,7 +93,12 @@ export default function ScanForm() {
           timeout: 120000,
         }
       );
-      setResult(response.data);
+      const scan: ScanResult = response.data;
+      setResult(scan);
+
+      if (!scan.summary && scan.task_id) {
+        pollSummary(backendUrl, scan.task_id);
+      }
     } catch (err: any) {
       console.error("Scan error:", err);
       if (err.code === "ECONNABORTED") {
@@ -154,9 +192,16 @@ export default function ScanForm() {
               <h3 className="font-semibold text-blue-900 dark:text-blue-300 mb-2">
                 🤖 AI Security Analysis
               </h3>
-              <div className="text-blue-800 dark:text-blue-200 whitespace-pre-wrap text-sm">
-                {result.summary}
-              </div>
+              {result.summary ? (
+                <div className="text-blue-800 dark:text-blue-200 whitespace-pre-wrap text-sm">
+                  {result.summary}
+                </div>
+              ) : (
+                <div className="flex items-center text-blue-800 dark:text-blue-200 text-sm">
+                  <div className="animate-spin rounded-full h-4 w-4 border-b-2 border-blue-600 mr-2"></div>
+                  Generating AI analysis...
+                </div>
+              )}
             </div>
 
             {/* Detailed Results */}